@@ -0,0 +1,138 @@
+# bench_intervals.py
+# Compares the old datetime-tuple parsing against intervals.parse_intervals
+# on a synthetic calendar. Run: python bench_intervals.py [num_events] [repeat]
+import sys
+import timeit
+import tracemalloc
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from intervals import merge_intervals, parse_epoch, parse_intervals
+
+
+def make_events(n: int, slots: int) -> list:
+    """
+    Builds n Google-Calendar-shaped events, 30-60 min long, cycling over
+    `slots` hour slots so start/end strings repeat once n > slots.
+    """
+    base = datetime(2025, 1, 6, 8, 0, tzinfo=timezone.utc)
+    events = []
+    for i in range(n):
+        start = base + timedelta(hours=i % slots)
+        end = start + timedelta(minutes=30 * (1 + i % 2))
+        # Mix "Z" and explicit offsets like the API does
+        if i % 2:
+            start_str = start.isoformat().replace("+00:00", "Z")
+            end_str = end.isoformat().replace("+00:00", "Z")
+        else:
+            start_str = start.astimezone(timezone(timedelta(hours=-8))).isoformat()
+            end_str = end.astimezone(timezone(timedelta(hours=-8))).isoformat()
+        events.append({
+            "summary": f"Event {i}",
+            "start": {"dateTime": start_str},
+            "end": {"dateTime": end_str},
+        })
+    # The API returns events ordered by start time
+    events.sort(key=lambda e: parse_epoch(e["start"]["dateTime"]))
+    return events
+
+
+def old_ranges(events: list) -> list:
+    """The previous generate_work_blocks parsing, kept here for comparison."""
+    existing_ranges = []
+    for event in events:
+        start_str = event.get("start", {}).get("dateTime")
+        end_str = event.get("end", {}).get("dateTime")
+        if start_str and end_str:
+            try:
+                if start_str.endswith("Z"):
+                    start = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
+                else:
+                    start = datetime.fromisoformat(start_str)
+                if end_str.endswith("Z"):
+                    end = datetime.fromisoformat(end_str.replace("Z", "+00:00"))
+                else:
+                    end = datetime.fromisoformat(end_str)
+                if start.tzinfo:
+                    start = start.replace(tzinfo=None)
+                if end.tzinfo:
+                    end = end.replace(tzinfo=None)
+                existing_ranges.append((start, end))
+            except Exception:
+                pass
+    return existing_ranges
+
+
+def per_string_intervals(events: list):
+    """Same output as parse_intervals, but parses every string without memoizing."""
+    starts = array("q")
+    ends = array("q")
+    for event in events:
+        start_str = event.get("start", {}).get("dateTime")
+        end_str = event.get("end", {}).get("dateTime")
+        if isinstance(start_str, str) and isinstance(end_str, str):
+            try:
+                start = parse_epoch(start_str)
+                end = parse_epoch(end_str)
+            except ValueError:
+                continue
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+def best_ms(fn, *args, repeat: int) -> float:
+    return min(timeit.repeat(lambda: fn(*args), number=1, repeat=repeat)) * 1000
+
+
+def peak_mb(fn, *args) -> float:
+    # Measured apart from timing since tracemalloc slows allocation-heavy code a lot
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def tuples_bytes(ranges: list) -> int:
+    # list + one tuple + two datetimes per entry
+    total = sys.getsizeof(ranges)
+    for pair in ranges:
+        total += sys.getsizeof(pair) + sys.getsizeof(pair[0]) + sys.getsizeof(pair[1])
+    return total
+
+
+def arrays_bytes(starts: array, ends: array) -> int:
+    return sys.getsizeof(starts) + sys.getsizeof(ends)
+
+
+def run(n: int, slots: int, repeat: int):
+    events = make_events(n, slots)
+    old = old_ranges(events)
+    raw = parse_intervals(events)
+    merged = merge_intervals(*raw)
+    unique = len({s for e in events for s in (e["start"]["dateTime"], e["end"]["dateTime"])})
+
+    print(f"{n} events, {unique} distinct time strings (best of {repeat})")
+    print("  parse:")
+    print(f"    datetime tuples (old): {best_ms(old_ranges, events, repeat=repeat):8.1f} ms, "
+          f"peak {peak_mb(old_ranges, events):5.1f} MB")
+    print(f"    per-string epochs:     {best_ms(per_string_intervals, events, repeat=repeat):8.1f} ms, "
+          f"peak {peak_mb(per_string_intervals, events):5.1f} MB")
+    print(f"    parse_intervals:       {best_ms(parse_intervals, events, repeat=repeat):8.1f} ms, "
+          f"peak {peak_mb(parse_intervals, events):5.1f} MB")
+    print(f"  merge: {best_ms(merge_intervals, *raw, repeat=repeat):8.1f} ms "
+          f"({len(raw[0])} -> {len(merged[0])} intervals)")
+    print("  storage for the parsed events:")
+    print(f"    datetime tuples: {tuples_bytes(old) / len(old):6.1f} B/event")
+    print(f"    epoch arrays:    {arrays_bytes(*raw) / len(raw[0]):6.1f} B/event")
+    print(f"    merged arrays:   {arrays_bytes(*merged) / 1e3:6.1f} KB total "
+          f"vs {tuples_bytes(old) / 1e3:.1f} KB of tuples for the same events")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    # Repeated strings (recurring meetings) vs. every string unique
+    run(n, slots=2000, repeat=repeat)
+    run(n, slots=n, repeat=repeat)
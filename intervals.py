@@ -0,0 +1,110 @@
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+
+# Strings looked up before deciding whether memoizing parses is worth it
+_MEMO_PROBE = 1024
+
+
+def parse_epoch(value: str) -> int:
+    """
+    Parses an RFC3339 timestamp into epoch seconds.
+    Offsets (including "Z") are honored; naive values are treated as local time.
+    """
+    if value[-1:] in ("Z", "z"):
+        value = value[:-1] + "+00:00"
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def _try_parse_epoch(value: str):
+    try:
+        return parse_epoch(value)
+    except ValueError:
+        return None
+
+
+def parse_intervals(events: list):
+    """
+    Parses timed events into raw (starts, ends) int64 arrays of epoch seconds,
+    in input order. Events sharing a start or end time repeat the exact same
+    string, so parsed values are memoized while that keeps paying off.
+    All-day events and events with missing or unparseable times are skipped.
+    """
+    starts = array("q")
+    ends = array("q")
+    epochs = {}
+    lookups = hits = 0
+    for event in events:
+        start_str = event.get("start", {}).get("dateTime")
+        end_str = event.get("end", {}).get("dateTime")
+        if not (isinstance(start_str, str) and isinstance(end_str, str)):
+            continue
+
+        if epochs is None:
+            start = _try_parse_epoch(start_str)
+            end = _try_parse_epoch(end_str)
+        else:
+            if start_str in epochs:
+                start = epochs[start_str]
+                hits += 1
+            else:
+                start = epochs[start_str] = _try_parse_epoch(start_str)
+            if end_str in epochs:
+                end = epochs[end_str]
+                hits += 1
+            else:
+                end = epochs[end_str] = _try_parse_epoch(end_str)
+
+            lookups += 2
+            # Mostly unique strings: the memo only costs time and memory
+            if lookups == _MEMO_PROBE and hits * 4 < lookups:
+                epochs = None
+
+        if start is not None and end is not None:
+            starts.append(start)
+            ends.append(end)
+
+    return starts, ends
+
+
+def merge_intervals(raw_starts: array, raw_ends: array):
+    """
+    Sorts and merges raw intervals into disjoint busy intervals.
+    Overlapping or touching intervals are joined; empty ones are dropped.
+    """
+    order = range(len(raw_starts))
+    # The Calendar API already returns events ordered by start time
+    if any(raw_starts[i] > raw_starts[i + 1] for i in range(len(raw_starts) - 1)):
+        order = sorted(order, key=raw_starts.__getitem__)
+
+    starts = array("q")
+    ends = array("q")
+    for i in order:
+        start, end = raw_starts[i], raw_ends[i]
+        if end <= start:
+            continue
+        if ends and start <= ends[-1]:
+            # Overlaps or touches the previous interval, extend it
+            if end > ends[-1]:
+                ends[-1] = end
+        else:
+            starts.append(start)
+            ends.append(end)
+
+    return starts, ends
+
+
+def busy_intervals(events: list):
+    """
+    Parses timed events into sorted, merged busy intervals.
+    Returns (starts, ends) as int64 arrays of epoch seconds.
+    """
+    return merge_intervals(*parse_intervals(events))
+
+
+def is_busy(busy, start: int, end: int) -> bool:
+    """Check if [start, end) overlaps any merged busy interval."""
+    starts, ends = busy
+    # First interval that ends after our start is the only candidate
+    i = bisect_right(ends, start)
+    return i < len(starts) and starts[i] < end
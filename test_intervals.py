@@ -0,0 +1,120 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from intervals import busy_intervals, is_busy, merge_intervals, parse_epoch, parse_intervals
+
+
+def event(start: str, end: str) -> dict:
+    return {"start": {"dateTime": start}, "end": {"dateTime": end}}
+
+
+@pytest.fixture
+def los_angeles_tz():
+    old_tz = os.environ.get("TZ")
+    os.environ["TZ"] = "America/Los_Angeles"
+    time.tzset()
+    yield
+    if old_tz is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = old_tz
+    time.tzset()
+
+
+def test_parse_epoch_normalizes_offsets():
+    assert parse_epoch("2025-01-01T10:00:00-08:00") == parse_epoch("2025-01-01T18:00:00Z")
+    assert parse_epoch("2025-01-01T18:00:00Z") == 1735754400
+
+
+def test_offset_and_utc_events_merge():
+    busy = busy_intervals([
+        event("2025-01-01T19:00:00Z", "2025-01-01T20:00:00Z"),
+        event("2025-01-01T10:00:00-08:00", "2025-01-01T11:30:00-08:00"),
+    ])
+    assert list(busy[0]) == [parse_epoch("2025-01-01T18:00:00Z")]
+    assert list(busy[1]) == [parse_epoch("2025-01-01T20:00:00Z")]
+
+
+def test_touching_intervals_merge():
+    busy = busy_intervals([
+        event("2025-01-01T09:00:00Z", "2025-01-01T10:00:00Z"),
+        event("2025-01-01T10:00:00Z", "2025-01-01T11:00:00Z"),
+    ])
+    assert list(busy[0]) == [parse_epoch("2025-01-01T09:00:00Z")]
+    assert list(busy[1]) == [parse_epoch("2025-01-01T11:00:00Z")]
+
+
+def test_unsorted_input_and_empty_intervals():
+    starts, ends = merge_intervals(*parse_intervals([
+        event("2025-01-01T12:00:00Z", "2025-01-01T13:00:00Z"),
+        event("2025-01-01T09:00:00Z", "2025-01-01T10:00:00Z"),
+        event("2025-01-01T11:00:00Z", "2025-01-01T11:00:00Z"),
+        event("2025-01-01T15:00:00Z", "2025-01-01T14:00:00Z"),
+    ]))
+    assert list(starts) == [parse_epoch("2025-01-01T09:00:00Z"), parse_epoch("2025-01-01T12:00:00Z")]
+    assert list(ends) == [parse_epoch("2025-01-01T10:00:00Z"), parse_epoch("2025-01-01T13:00:00Z")]
+
+
+def test_all_day_and_malformed_events_skipped():
+    starts, ends = parse_intervals([
+        {"start": {"date": "2025-01-01"}, "end": {"date": "2025-01-02"}},
+        event("not a time", "2025-01-01T10:00:00Z"),
+        event("", "2025-01-01T10:00:00Z"),
+        {"start": {"dateTime": 1735722000}, "end": {"dateTime": None}},
+        {"summary": "No times"},
+        event("2025-01-01T09:00:00Z", "2025-01-01T10:00:00Z"),
+    ])
+    assert list(starts) == [parse_epoch("2025-01-01T09:00:00Z")]
+    assert list(ends) == [parse_epoch("2025-01-01T10:00:00Z")]
+
+
+def test_repeated_strings_parse_the_same():
+    events = [event("2025-01-01T09:00:00Z", "2025-01-01T10:00:00Z")] * 2000
+    events += [event("bad", "2025-01-01T10:00:00Z")] * 10
+    starts, ends = parse_intervals(events)
+    assert len(starts) == len(ends) == 2000
+    assert set(starts) == {parse_epoch("2025-01-01T09:00:00Z")}
+
+
+def test_is_busy_half_open_boundaries():
+    busy = merge_intervals(*parse_intervals([event("2025-01-01T10:00:00Z", "2025-01-01T11:00:00Z")]))
+    ten = parse_epoch("2025-01-01T10:00:00Z")
+    eleven = parse_epoch("2025-01-01T11:00:00Z")
+
+    # Busy interval starts exactly at our end, or ends exactly at our start
+    assert not is_busy(busy, ten - 3600, ten)
+    assert not is_busy(busy, eleven, eleven + 3600)
+    assert is_busy(busy, ten - 3600, ten + 1)
+    assert is_busy(busy, eleven - 1, eleven + 3600)
+    assert is_busy(busy, ten + 60, ten + 120)
+    assert not is_busy(([], []), ten, eleven)
+
+
+def test_generate_work_blocks_respects_event_offsets(los_angeles_tz):
+    pytest.importorskip("requests")
+    pytest.importorskip("googleapiclient")
+    from main import generate_work_blocks
+
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    due_date = (today + timedelta(days=3)).replace(hour=23, minute=59)
+
+    # 5pm-9pm Los Angeles every day, written in Tokyo time (01:00-05:00 next day)
+    tokyo = lambda dt: (dt + timedelta(hours=17)).isoformat() + "+09:00"
+    blocking = [
+        event(tokyo(today + timedelta(days=d, hours=17)), tokyo(today + timedelta(days=d, hours=21)))
+        for d in range(4)
+    ]
+    assert generate_work_blocks(2, due_date, blocking) == []
+
+    # 5pm-9pm Tokyo wall time is early morning in Los Angeles, so it must not block
+    harmless = [
+        event((today + timedelta(days=d, hours=17)).isoformat() + "+09:00",
+              (today + timedelta(days=d, hours=21)).isoformat() + "+09:00")
+        for d in range(4)
+    ]
+    blocks = generate_work_blocks(2, due_date, harmless)
+    assert len(blocks) == 1
+    assert blocks[0][0].hour == 17
@@ -7,6 +7,8 @@ from datetime import datetime, timedelta
 import os
 import json
 
+from intervals import parse_epoch
+
 import subprocess
 import webbrowser
 
@@ -80,10 +82,10 @@ def get_today_events():
             
             # Format time
             if "T" in start_raw:
-                dt = datetime.fromisoformat(start_raw.replace("Z", "+00:00"))
+                # Show in local time regardless of the event's own offset
+                dt = datetime.fromtimestamp(parse_epoch(start_raw))
                 start_formatted = dt.strftime("%I:%M %p")
             else:
-                dt = datetime.fromisoformat(start_raw)
                 start_formatted = "All day"
             
             summary = event.get("summary", "No title")